@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Shared High/Low bet-resolution kernel.
+The action map is parsed once into a BetTable (thresholds,
+payouts, amounts as arrays); every engine - the step-wise
+SimulationEnv, the batch simulator and analytics - resolves
+bets through this module so payout semantics stay identical.
+Uses Numba when it is installed, vectorised NumPy otherwise.
+"""
+from typing import Dict, NamedTuple, Tuple
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
+
+ROLL_RANGE = 10000   # Rolls are integers in [0, 9999]
+HOUSE_EDGE = 0.99    # 1% house edge
+
+class BetTable(NamedTuple):
+    """Per-action bet parameters, indexed by action id."""
+    thresholds: np.ndarray  # int64: winning rolls per 10000 (chance * 100)
+    payouts: np.ndarray     # float64: gross payout multiplier on a win
+    amounts: np.ndarray     # float64: stake in balance units
+    # The same values as plain Python (threshold, payout, amount) tuples;
+    # the scalar path uses these since NumPy scalar math is slower per bet.
+    per_action: Tuple[Tuple[int, float, float], ...]
+
+def build_bet_table(action_map: Dict[int, Tuple[str, float]], base_bet: float) -> BetTable:
+    """Parses an env `action_map` ({id: (chance_str, multiplier)}) once."""
+    n_actions = max(action_map) + 1
+    thresholds = np.zeros(n_actions, dtype=np.int64)
+    payouts = np.zeros(n_actions, dtype=np.float64)
+    amounts = np.zeros(n_actions, dtype=np.float64)
+    for action_id, (chance_str, multiplier) in action_map.items():
+        chance = float(chance_str)
+        thresholds[action_id] = int(chance * 100)
+        payouts[action_id] = (100.0 / chance) * HOUSE_EDGE
+        amounts[action_id] = base_bet * multiplier
+    per_action = tuple(zip(thresholds.tolist(), payouts.tolist(), amounts.tolist()))
+    return BetTable(thresholds, payouts, amounts, per_action)
+
+def resolve_bet(table: BetTable, action_id: int, roll: int, is_high: bool) -> float:
+    """Returns the profit of a single bet (scalar path for step-wise envs)."""
+    threshold, payout, amount = table.per_action[action_id]
+    is_win = roll >= ROLL_RANGE - threshold if is_high else roll < threshold
+    if is_win:
+        return (amount * payout) - amount
+    return -amount
+
+def _simulate_numpy(thresholds, payouts, amounts, actions, rolls, is_high, start_balance):
+    stake = amounts[actions]
+    limit = thresholds[actions]
+    is_win = np.where(is_high, rolls >= ROLL_RANGE - limit, rolls < limit)
+    profits = np.where(is_win, (stake * payouts[actions]) - stake, -stake)
+
+    # A bet is only placed while the stake fits in the balance; the
+    # first bet that does not fit ends the run. Accumulating from
+    # start_balance keeps rounding identical to the loop kernel.
+    running = np.cumsum(np.concatenate(([start_balance], profits)))
+    balances, before = running[1:], running[:-1]
+    busted = np.flatnonzero(stake > before)
+    n_executed = int(busted[0]) if busted.size else len(actions)
+    profits[n_executed:] = 0.0
+    balances[n_executed:] = balances[n_executed - 1] if n_executed else start_balance
+    return profits, balances, n_executed
+
+def _simulate_loop(thresholds, payouts, amounts, actions, rolls, is_high, start_balance):
+    n = actions.shape[0]
+    profits = np.zeros(n, dtype=np.float64)
+    balances = np.full(n, start_balance, dtype=np.float64)
+    balance = start_balance
+    for i in range(n):
+        a = actions[i]
+        stake = amounts[a]
+        if stake > balance:
+            balances[i:] = balance
+            return profits, balances, i
+        if is_high[i]:
+            is_win = rolls[i] >= ROLL_RANGE - thresholds[a]
+        else:
+            is_win = rolls[i] < thresholds[a]
+        profit = (stake * payouts[a]) - stake if is_win else -stake
+        profits[i] = profit
+        balance += profit
+        balances[i] = balance
+    return profits, balances, n
+
+_simulate = njit(cache=True)(_simulate_loop) if njit is not None else _simulate_numpy
+
+def simulate_bets(table: BetTable, actions: np.ndarray, rolls: np.ndarray,
+                  is_high: np.ndarray, start_balance: float) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Resolves a sequence of bets in one call.
+    Returns (profits, balances, n_executed): per-bet profit,
+    balance after each bet, and how many bets were placed
+    before the stake exceeded the balance (later bets are 0).
+    """
+    actions = np.asarray(actions)
+    rolls = np.asarray(rolls, dtype=np.int64)
+    is_high = np.asarray(is_high, dtype=np.bool_)
+    if actions.ndim != 1 or rolls.shape != actions.shape or is_high.shape != actions.shape:
+        raise ValueError("actions, rolls and is_high must be 1-D arrays of the same length")
+    # Mirror BaseStrategyEnv.step: reject rather than wrap or truncate.
+    # The Numba kernel has no bounds checks, so this is the only guard.
+    if actions.size:
+        if not np.issubdtype(actions.dtype, np.integer):
+            raise ValueError(f"Invalid actions: expected integer ids, got {actions.dtype}")
+        if actions.min() < 0 or actions.max() >= len(table.amounts):
+            raise ValueError(f"Invalid action: ids must be in [0, {len(table.amounts)})")
+    profits, balances, n_executed = _simulate(
+        table.thresholds, table.payouts, table.amounts,
+        actions.astype(np.int64), rolls, is_high, float(start_balance),
+    )
+    return profits, balances, int(n_executed)
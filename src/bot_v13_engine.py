@@ -4,12 +4,16 @@ This provides a minimal interface so the server and UI can interact
 without the full production bot implementation.
 """
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from .profiler import JobProfiler, NULL_PROFILER, ENV_STEP, LOG_EMISSION
 
 class QuantumLeapBot_v13_Engine:
-    def __init__(self, strategy_config: Dict[str, Any], emit_callback=None):
+    def __init__(self, strategy_config: Dict[str, Any], emit_callback=None,
+                 profiler: Optional[JobProfiler] = None):
         self.strategy_config = strategy_config
-        self.emit_callback = emit_callback
+        # Profiling is opt-in; the null profiler makes sections free
+        self.profiler = profiler or NULL_PROFILER
+        self.emit_callback = self.profiler.wrap_async(LOG_EMISSION, emit_callback) if emit_callback else None
         self._running = False
         self._task = None
         self.nonce = 0
@@ -18,7 +22,8 @@ class QuantumLeapBot_v13_Engine:
         # Simple simulated betting loop that emits logs occasionally
         while self._running:
             await asyncio.sleep(0.5)
-            self.nonce += 1
+            with self.profiler.section(ENV_STEP):
+                self.nonce += 1
             if self.emit_callback:
                 await self.emit_callback({
                     "type": "log",
@@ -30,6 +35,7 @@ class QuantumLeapBot_v13_Engine:
         if self._running:
             return
         self._running = True
+        self.profiler.start()
         self._task = asyncio.create_task(self._run_loop())
 
     def stop(self):
@@ -39,3 +45,4 @@ class QuantumLeapBot_v13_Engine:
         if self._task:
             self._task.cancel()
             self._task = None
+        self.profiler.stop()
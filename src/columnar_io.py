@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Columnar file helpers for bulk strategy / HPT result transfer.
+Supports NumPy `.npz` archives (always available) and Apache Parquet
+(`.parquet`, requires the optional `pyarrow` package).
+"""
+import os
+import zipfile
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet support is optional
+    pa = None
+    pq = None
+
+FORMATS = ("npz", "parquet")
+# Column kinds accepted by write_batches
+COLUMN_KINDS = ("int", "float", "str")
+# NPZ stores each column's nulls in a boolean companion array "<col>__null"
+NULL_SUFFIX = "__null"
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lstrip('.').lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Unsupported columnar format '{ext}' (expected one of {FORMATS})")
+    return ext
+
+def _require_pyarrow():
+    if pq is None:
+        raise RuntimeError("Parquet support requires pyarrow: pip install pyarrow")
+
+def _to_arrays(values: List[Any], kind: str) -> Tuple[np.ndarray, np.ndarray]:
+    # Stored without object dtype so the archive loads without pickle.
+    # Nulls get a placeholder value and are recorded in the mask, so ''
+    # and NaN survive the round trip as themselves.
+    mask = np.array([v is None for v in values], dtype=np.bool_)
+    if kind == "str":
+        return np.array(['' if v is None else str(v) for v in values], dtype=str), mask
+    dtype = np.int64 if kind == "int" else np.float64
+    return np.array([0 if v is None else v for v in values], dtype=dtype), mask
+
+def _arrow_schema(columns: Dict[str, str]):
+    types = {"int": pa.int64(), "float": pa.float64(), "str": pa.string()}
+    return pa.schema([(name, types[kind]) for name, kind in columns.items()])
+
+def write_batches(path: str, columns: Dict[str, str], batches: Iterable[List[Dict[str, Any]]]) -> int:
+    """Writes batches of row dicts to `path` and returns the row count.
+    `columns` maps each column name to one of COLUMN_KINDS; the schema is
+    fixed up front so all-null columns in early batches cannot clash with
+    later ones. Parquet output is streamed one row group per batch; NPZ
+    output is accumulated per column and written once at the end.
+    """
+    fmt = detect_format(path)
+    for name, kind in columns.items():
+        if kind not in COLUMN_KINDS:
+            raise ValueError(f"Column '{name}' has unknown kind '{kind}' (expected one of {COLUMN_KINDS})")
+    count = 0
+    if fmt == "parquet":
+        _require_pyarrow()
+        schema = _arrow_schema(columns)
+        with pq.ParquetWriter(path, schema) as writer:
+            for batch in batches:
+                if not batch:
+                    continue
+                table = pa.Table.from_pydict({c: [row.get(c) for row in batch] for c in columns}, schema=schema)
+                writer.write_table(table)
+                count += len(batch)
+        return count
+
+    data: Dict[str, List[Any]] = {c: [] for c in columns}
+    for batch in batches:
+        for row in batch:
+            for c in columns:
+                data[c].append(row.get(c))
+        count += len(batch)
+    arrays = {}
+    for c, values in data.items():
+        arrays[c], arrays[c + NULL_SUFFIX] = _to_arrays(values, columns[c])
+    np.savez_compressed(path, **arrays)
+    return count
+
+def _load_npz(path: str) -> Dict[str, Tuple[list, list]]:
+    """Returns {column: (values, null_mask)} as Python lists."""
+    try:
+        with np.load(path, allow_pickle=False) as archive:
+            if not isinstance(archive, np.lib.npyio.NpzFile):
+                raise ValueError("not an .npz archive")
+            arrays = {name: archive[name] for name in archive.files}
+    except (OSError, EOFError, ValueError, zipfile.BadZipFile) as e:
+        raise ValueError(f"Could not read NPZ file: {e}") from e
+
+    columns = {}
+    for name, values in arrays.items():
+        if name.endswith(NULL_SUFFIX):
+            continue
+        mask = arrays.get(name + NULL_SUFFIX, np.zeros(len(values), dtype=np.bool_))
+        if values.ndim != 1 or mask.shape != values.shape:
+            raise ValueError(f"Column '{name}' is not a 1-D array matching its null mask")
+        columns[name] = (values.tolist(), mask.tolist())
+    if len({len(values) for values, _ in columns.values()}) > 1:
+        raise ValueError("NPZ columns have different lengths")
+    return columns
+
+def read_batches(path: str, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+    """Yields lists of row dicts (at most `batch_size` each) from `path`."""
+    fmt = detect_format(path)
+    if fmt == "parquet":
+        _require_pyarrow()
+        try:
+            for record_batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+                yield record_batch.to_pylist()
+        except (OSError, pa.ArrowException) as e:
+            raise ValueError(f"Could not read Parquet file: {e}") from e
+        return
+
+    columns = _load_npz(path)
+    n_rows = len(next(iter(columns.values()))[0]) if columns else 0
+    for start in range(0, n_rows, batch_size):
+        stop = min(start + batch_size, n_rows)
+        yield [
+            {name: (None if mask[i] else values[i]) for name, (values, mask) in columns.items()}
+            for i in range(start, stop)
+        ]
@@ -4,10 +4,20 @@ This is a lightweight SQLite wrapper to store simple strategy records.
 """
 import sqlite3
 import os
-from typing import Dict, Any, Iterable
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "quantumleap.db")
 
+# Columns accepted on insert/import (everything except the primary key)
+STRATEGY_FIELDS = ('name', 'currency', 'base_bet_divisor', 'profit_target_percent', 'loss_limit_percent', 'kappa')
+# Columns that must be present (and non-null) on import
+REQUIRED_FIELDS = ('name',)
+# Column kinds for columnar export (see columnar_io.COLUMN_KINDS)
+EXPORT_COLUMNS = {'id': 'int', 'name': 'str', 'currency': 'str', 'base_bet_divisor': 'float',
+                  'profit_target_percent': 'float', 'loss_limit_percent': 'float', 'kappa': 'float'}
+# Numeric columns that can be filtered by range; each one is indexed
+RANGE_FIELDS = ('base_bet_divisor', 'profit_target_percent', 'loss_limit_percent', 'kappa')
+
 def _get_conn():
     return sqlite3.connect(DB_PATH)
 
@@ -25,6 +35,10 @@ def initialize_db():
             kappa REAL
         )'''
     )
+    # (currency, id) serves the common "one currency, paged by id" query
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_strategies_currency ON strategies (currency, id)')
+    for field in RANGE_FIELDS:
+        cur.execute(f'CREATE INDEX IF NOT EXISTS idx_strategies_{field} ON strategies ({field})')
     conn.commit()
     conn.close()
 
@@ -40,14 +54,12 @@ def create_strategy(data: Dict[str, Any]) -> int:
     conn.close()
     return strategy_id
 
-def get_all_strategies() -> Iterable[Dict[str, Any]]:
-    conn = _get_conn()
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute('SELECT * FROM strategies')
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+def _insert_many(conn, rows: Iterable[Dict[str, Any]]) -> int:
+    cur = conn.executemany(
+        f'INSERT INTO strategies ({", ".join(STRATEGY_FIELDS)}) VALUES ({",".join("?" * len(STRATEGY_FIELDS))})',
+        (tuple(row.get(f) for f in STRATEGY_FIELDS) for row in rows)
+    )
+    return cur.rowcount
 
 def get_strategy(strategy_id: int):
     conn = _get_conn()
@@ -57,3 +69,73 @@ def get_strategy(strategy_id: int):
     row = cur.fetchone()
     conn.close()
     return row
+
+def query_strategies(
+    currency: Optional[str] = None,
+    ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+    after_id: Optional[int] = None,
+    limit: int = 100,
+) -> List[sqlite3.Row]:
+    """Returns one page of strategies ordered by id.
+    `ranges` maps a column in RANGE_FIELDS to an inclusive (min, max) pair;
+    either bound may be None. Pagination is keyset-based: pass the last id
+    of the previous page as `after_id`.
+    """
+    clauses, params = [], []
+    if currency is not None:
+        clauses.append('currency = ?'); params.append(currency)
+    for field, (low, high) in (ranges or {}).items():
+        if field not in RANGE_FIELDS:
+            raise ValueError(f"Cannot filter strategies by '{field}'")
+        if low is not None:
+            clauses.append(f'{field} >= ?'); params.append(low)
+        if high is not None:
+            clauses.append(f'{field} <= ?'); params.append(high)
+    if after_id is not None:
+        clauses.append('id > ?'); params.append(after_id)
+    where = f' WHERE {" AND ".join(clauses)}' if clauses else ''
+
+    conn = _get_conn()
+    conn.row_factory = sqlite3.Row
+    cur = conn.cursor()
+    cur.execute(f'SELECT * FROM strategies{where} ORDER BY id LIMIT ?', (*params, limit))
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+def iter_strategies(batch_size: int = 1000, **filters) -> Iterator[List[Dict[str, Any]]]:
+    """Yields every matching strategy as batches of dicts, one page at a time."""
+    after_id = None
+    while True:
+        rows = query_strategies(after_id=after_id, limit=batch_size, **filters)
+        if not rows:
+            return
+        yield [dict(row) for row in rows]
+        if len(rows) < batch_size:
+            return
+        after_id = rows[-1]['id']
+
+def export_strategies(path: str, batch_size: int = 1000, **filters) -> int:
+    """Streams matching strategies to a .npz or .parquet file. Returns the row count."""
+    from .columnar_io import write_batches
+    return write_batches(path, EXPORT_COLUMNS, iter_strategies(batch_size=batch_size, **filters))
+
+def import_strategies(path: str, batch_size: int = 1000) -> int:
+    """Loads strategies from a .npz or .parquet file as new rows (ids are reassigned).
+    The whole file is imported in one transaction: a missing required column
+    raises ValueError, a constraint violation raises sqlite3.IntegrityError,
+    and in both cases nothing is inserted.
+    """
+    from .columnar_io import read_batches
+    conn = _get_conn()
+    try:
+        with conn:  # Commits on success, rolls back on error
+            count = 0
+            for batch in read_batches(path, batch_size=batch_size):
+                missing = [f for f in REQUIRED_FIELDS if batch and f not in batch[0]]
+                if missing:
+                    raise ValueError(f"Import file is missing required columns: {', '.join(missing)}")
+                count += _insert_many(conn, batch)
+            return count
+    finally:
+        conn.close()
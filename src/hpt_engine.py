@@ -7,8 +7,9 @@ optimal hyperparameters for a given agent.
 import optuna
 import asyncio
 import numpy as np
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, Optional
 from .simulation_env_v14 import SimulationEnv
+from .profiler import JobProfiler, NULL_PROFILER, ENV_STEP, AGENT_INFERENCE, OPTUNA_STORAGE, LOG_EMISSION
 
 # We must import the AI agents. For this, we need a
 # "model zoo" file. This file (src/model_zoo.py) would contain
@@ -18,24 +19,28 @@ from .simulation_env_v14 import SimulationEnv
 # --- Dummy Training Function ---
 # In a real system, this would import from src.model_zoo
 # and run a full training loop.
-async def train_dummy_agent(env: SimulationEnv, trial: optuna.Trial) -> float:
+async def train_dummy_agent(env: SimulationEnv, trial: optuna.Trial, profiler=NULL_PROFILER) -> float:
     """
     A dummy function representing a full RL training loop.
     It uses the 'trial' object to get hyperparameters.
     """
     # Suggest hyperparameters
-    lr = trial.suggest_float("lr", 1e-5, 1e-3, log=True)
-    gamma = trial.suggest_float("gamma", 0.9, 0.999)
+    with profiler.section(OPTUNA_STORAGE):
+        lr = trial.suggest_float("lr", 1e-5, 1e-3, log=True)
+        gamma = trial.suggest_float("gamma", 0.9, 0.999)
     
     # Simulate a training run
     total_reward = 0
     obs, info = env.reset()
     for _ in range(1000): # Simulate 1000 bets
-        action = env.action_space.sample() # Dummy policy
-        obs, reward, terminated, truncated, info = await env.step(action)
+        with profiler.section(AGENT_INFERENCE):
+            action = env.action_space.sample() # Dummy policy
+        with profiler.section(ENV_STEP):
+            obs, reward, terminated, truncated, info = await env.step(action)
         total_reward += reward
         if terminated or truncated:
-            obs, info = env.reset()
+            with profiler.section(ENV_STEP):
+                obs, info = env.reset()
             
     # Return the objective to maximize (final P/L)
     final_pl = env.session_profit
@@ -44,10 +49,14 @@ async def train_dummy_agent(env: SimulationEnv, trial: optuna.Trial) -> float:
 
 
 class HyperparameterEngine:
-    def __init__(self, strategy_config: Dict[str, Any], emit_callback: Callable):
+    def __init__(self, strategy_config: Dict[str, Any], emit_callback: Callable,
+                 profiler: Optional[JobProfiler] = None):
         self.strategy_config = strategy_config
-        self.emit_log = emit_callback
+        # Profiling is opt-in; the null profiler makes sections free
+        self.profiler = profiler or NULL_PROFILER
+        self.emit_log = self.profiler.wrap_async(LOG_EMISSION, emit_callback)
         self.db_url = "sqlite:///hpt_studies.db" # Optuna's DB
+        self.study_name = f"strategy_{strategy_config['id']}_{strategy_config['name']}"
 
     async def _objective(self, trial: optuna.Trial) -> float:
         """
@@ -64,7 +73,7 @@ class HyperparameterEngine:
         try:
             # --- This would call the real agent from the model zoo ---
             # e.g., result = await v15_ppo.train(env, trial)
-            final_pl = await train_dummy_agent(env, trial)
+            final_pl = await train_dummy_agent(env, trial, self.profiler)
             
             await self.emit_log({"type": "log", "level": "info", "message": f"HPT Trial {trial.number} finished. Final P/L: {final_pl:.8f}"})
             
@@ -77,22 +86,32 @@ class HyperparameterEngine:
         """
         Runs the full HPT study.
         """
+        self.profiler.start()
+        try:
+            return await self._run_study(n_trials)
+        finally:
+            self.profiler.stop()
+
+    async def _run_study(self, n_trials: int):
         await self.emit_log({"type": "log", "level": "info", "message": f"Starting HPT study '{self.strategy_config['name']}'..."})
         
         # Create or load the study
-        study = optuna.create_study(
-            study_name=f"strategy_{self.strategy_config['id']}_{self.strategy_config['name']}",
-            storage=self.db_url,
-            direction="maximize",
-            load_if_exists=True
-        )
+        with self.profiler.section(OPTUNA_STORAGE):
+            study = optuna.create_study(
+                study_name=self.study_name,
+                storage=self.db_url,
+                direction="maximize",
+                load_if_exists=True
+            )
         
         # Run the optimization trials
         # Optuna's `optimize` is synchronous, so we run it
         # in a loop of async calls.
         for i in range(n_trials):
             await self.emit_log({"type": "log", "level": "info", "message": f"Enqueuing HPT trial {i+1}/{n_trials}..."})
-            await self._objective(study.ask()) # This part needs to be wrapped
+            with self.profiler.section(OPTUNA_STORAGE):
+                trial = study.ask()
+            await self._objective(trial) # This part needs to be wrapped
             # A more robust solution would use asyncio.to_thread
             # or a proper worker queue.
             # For this simulation, we'll assume it's possible.
@@ -103,9 +122,50 @@ class HyperparameterEngine:
         
         await self.emit_log({"type": "log", "level": "info", "message": "HPT study complete."})
         
-        best_params = study.best_params
-        best_value = study.best_value
+        with self.profiler.section(OPTUNA_STORAGE):
+            best_params = study.best_params
+            best_value = study.best_value
         await self.emit_log({"type": "log", "level": "info", "message": f"Best P/L: {best_value:.8f}"})
         await self.emit_log({"type": "log", "level": "info", "message": f"Best Params: {best_params}"})
         
         return {"params": best_params, "value": best_value}
+
+    def export_results(self, path: str, batch_size: int = 1000) -> int:
+        """
+        Exports every trial of this strategy's study to a
+        .npz or .parquet file, one row per trial with a
+        `param_<name>` column per hyperparameter.
+        """
+        from .columnar_io import write_batches
+        study = optuna.load_study(study_name=self.study_name, storage=self.db_url)
+        trials = study.get_trials(deepcopy=False)
+        # Column kinds come from the search space, not the values, so
+        # params that are unset in early trials keep a stable type.
+        # A param seen with several distributions takes the widest kind.
+        widest = ("int", "float", "str")
+        param_kinds = {}
+        for t in trials:
+            for name, dist in t.distributions.items():
+                if isinstance(dist, optuna.distributions.IntDistribution):
+                    kind = "int"
+                elif isinstance(dist, optuna.distributions.FloatDistribution):
+                    kind = "float"
+                else:
+                    kind = "str"
+                param_kinds[name] = max(kind, param_kinds.get(name, kind), key=widest.index)
+        param_names = sorted(param_kinds)
+        columns = {"number": "int", "state": "str", "value": "float",
+                   **{f"param_{n}": param_kinds[n] for n in param_names}}
+        rows = [
+            {"number": t.number, "state": t.state.name, "value": t.value,
+             **{f"param_{n}": self._export_param(t.params.get(n), param_kinds[n]) for n in param_names}}
+            for t in trials
+        ]
+        batches = (rows[i:i + batch_size] for i in range(0, len(rows), batch_size))
+        return write_batches(path, columns, batches)
+
+    @staticmethod
+    def _export_param(value: Any, kind: str) -> Any:
+        if value is None or kind != "str":
+            return value
+        return str(value)
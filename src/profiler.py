@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Opt-in, low-overhead profiler for HPT studies and bot runs.
+Jobs mark their phases with `section(...)` (env stepping, agent
+inference, Optuna storage, log emission). A background thread samples
+the event-loop thread while a section is active *and* the task that
+entered it is the one running, so other jobs sharing the loop never
+leak into this job's breakdown. Samples are aggregated into collapsed
+stacks ("root;child;leaf count"), the input format of flamegraph.pl
+and speedscope.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, Optional
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs", "profiles")
+
+# Section names used by the engines
+ENV_STEP = "env_step"
+AGENT_INFERENCE = "agent_inference"
+OPTUNA_STORAGE = "optuna_storage"
+LOG_EMISSION = "log_emission"
+
+class JobProfiler:
+    def __init__(self, job_id: str, interval: float = 0.005):
+        self.job_id = job_id
+        self.interval = interval
+        self._sampler: Optional[threading.Thread] = None
+        self._reset()
+
+    def _reset(self):
+        self._wall: Dict[str, float] = {}
+        self._calls: Counter = Counter()
+        self._active: Dict[str, float] = {}  # Sampled seconds on the job's own task
+        self._samples: Counter = Counter()
+        self._samples_lock = threading.Lock()
+        # Active (name, task) sections, innermost last. Replaced (never
+        # mutated) so the sampler thread always sees a consistent tuple.
+        self._sections: tuple = ()
+        self._thread_id: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event = threading.Event()
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+
+    def start(self):
+        """Starts sampling the calling thread (the event loop running the job).
+        Starting again after stop() begins a fresh run under the same job id.
+        """
+        if self.running:
+            return
+        self._reset()
+        self._thread_id = threading.get_ident()
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+        self._started_at = time.perf_counter()
+        self._sampler = threading.Thread(target=self._sample_loop, name=f"profiler-{self.job_id}", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> Optional[str]:
+        """Stops sampling and writes the collapsed-stack artifact. Returns its path."""
+        if not self.running:
+            return None
+        self._stop_event.set()
+        self._sampler.join()
+        self._sampler = None
+        self._stopped_at = time.perf_counter()
+        return self.save()
+
+    @property
+    def running(self) -> bool:
+        return self._sampler is not None
+
+    def _current_task(self):
+        return asyncio.current_task(self._loop) if self._loop is not None else None
+
+    @contextmanager
+    def section(self, name: str):
+        self._sections = self._sections + ((name, self._current_task()),)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._wall[name] = self._wall.get(name, 0.0) + (time.perf_counter() - start)
+            self._calls[name] += 1
+            self._sections = self._sections[:-1]
+
+    def wrap_async(self, name: str, func):
+        """Wraps an async callable (e.g. an emit callback) in a section."""
+        async def wrapper(*args, **kwargs):
+            with self.section(name):
+                return await func(*args, **kwargs)
+        return wrapper
+
+    def _sample_loop(self):
+        last = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            # Credit the time since the previous wake-up: a busy loop thread
+            # holds the GIL and delays wake-ups, so fixed weights would
+            # under-count exactly the busy periods.
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            sections = self._sections
+            if not sections:
+                continue
+            name, task = sections[-1]
+            # While the job is suspended in an await, other tasks run on
+            # the same thread; their time is not this job's.
+            if self._current_task() is not task:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                frame = frame.f_back
+            stack.append(name)
+            with self._samples_lock:
+                self._samples[";".join(reversed(stack))] += 1
+                self._active[name] = self._active.get(name, 0.0) + elapsed
+
+    def _active_seconds(self) -> Dict[str, float]:
+        with self._samples_lock:
+            active = dict(self._active)
+        return {name: active.get(name, 0.0) for name in self._wall}
+
+    @property
+    def sample_count(self) -> int:
+        with self._samples_lock:
+            return sum(self._samples.values())
+
+    def collapsed(self) -> str:
+        """Returns the samples in collapsed-stack format."""
+        with self._samples_lock:
+            samples = self._samples.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in samples)
+
+    def summary(self) -> Dict[str, Any]:
+        if self._started_at is None:
+            wall = 0.0
+        else:
+            wall = (self._stopped_at or time.perf_counter()) - self._started_at
+        return {
+            "job_id": self.job_id,
+            "running": self.running,
+            "wall_time_s": wall,
+            "samples": self.sample_count,
+            "interval_s": self.interval,
+            # active_s: time the job's own task spent running in the section
+            # (sampled). wall_s: enter-to-exit time, including awaits.
+            "sections": {
+                name: {
+                    "calls": self._calls[name],
+                    "active_s": active_s,
+                    "wall_s": self._wall.get(name, 0.0),
+                    "share": (active_s / wall) if wall > 0 else 0.0,
+                }
+                for name, active_s in self._active_seconds().items()
+            },
+        }
+
+    def save(self) -> str:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{self.job_id}.folded")
+        with open(path, "w") as f:
+            f.write(self.collapsed())
+        return path
+
+class _NullProfiler:
+    """Stand-in used when profiling is off; sections cost nothing."""
+    def start(self):
+        pass
+
+    def stop(self):
+        return None
+
+    def section(self, name: str):
+        return nullcontext()
+
+    def wrap_async(self, name: str, func):
+        return func
+
+NULL_PROFILER = _NullProfiler()
@@ -10,16 +10,22 @@ QuantumLeap v18.0 "Chronos" - Control Server
 import asyncio
 import json
 import os
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
-from fastapi.responses import HTMLResponse, FileResponse
+import sqlite3
+import tempfile
+import time
+import uuid
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
+from fastapi.responses import HTMLResponse, FileResponse, PlainTextResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 import uvicorn
 from typing import List, Dict, Optional
 
 # Import all new engines
-from . import db_manager
+from . import db_manager, columnar_io
 from .bot_v13_engine import QuantumLeapBot_v13_Engine
 from .hpt_engine import HyperparameterEngine # v16.0 import
+from .profiler import JobProfiler, PROFILE_DIR
 
 app = FastAPI(title="QuantumLeap v18.0 Control Server")
 
@@ -48,6 +54,8 @@ async def emit_log_to_clients(data: Dict):
 bot_tasks: Dict[int, asyncio.Task] = {}
 bot_instances: Dict[int, QuantumLeapBot_v13_Engine] = {}
 hpt_tasks: Dict[int, asyncio.Task] = {} # v16.0 state
+job_profilers: Dict[str, JobProfiler] = {} # Profilers by job id, oldest first
+MAX_PROFILES_IN_MEMORY = 50 # Older finished jobs are served from their .folded file
 
 # --- Pydantic Models ---
 class Strategy(BaseModel):
@@ -56,8 +64,10 @@ class Strategy(BaseModel):
     kappa: float = 0.5
 class DeployConfig(BaseModel):
     strategy_id: int; mode: str = "live"; sim_start_balance: float = 1.0
+    profile: bool = False
 class HPTConfig(BaseModel):
     strategy_id: int; n_trials: int = 100
+    profile: bool = False
 
 @app.on_event("startup")
 def on_startup():
@@ -78,13 +88,76 @@ async def create_strategy(strategy: Strategy):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 @app.get("/api/strategies")
-async def get_strategies():
-    strategies = [dict(row) for row in db_manager.get_all_strategies()]
-    return {"status": "success", "strategies": strategies}
+async def get_strategies(request: Request, currency: Optional[str] = None,
+                         cursor: Optional[int] = None, limit: int = 100):
+    # Range filters are passed as min_<field> / max_<field>, e.g. ?min_kappa=0.3
+    limit = max(1, min(limit, 1000))
+    try:
+        ranges = _parse_range_filters(request)
+        rows = db_manager.query_strategies(currency=currency, ranges=ranges, after_id=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    strategies = [dict(row) for row in rows]
+    next_cursor = strategies[-1]["id"] if len(strategies) == limit else None
+    return {"status": "success", "strategies": strategies, "next_cursor": next_cursor}
+
+@app.get("/api/strategies/export")
+async def export_strategies(request: Request, format: str = "npz", currency: Optional[str] = None):
+    try:
+        ranges = _parse_range_filters(request)
+        path = _temp_path(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        await asyncio.to_thread(db_manager.export_strategies, path, currency=currency, ranges=ranges)
+    except Exception as e:
+        os.remove(path)
+        if isinstance(e, RuntimeError):
+            raise HTTPException(status_code=400, detail=str(e))
+        raise
+    return FileResponse(path, filename=f"strategies.{format}", background=BackgroundTask(os.remove, path))
+
+@app.post("/api/strategies/import")
+async def import_strategies(request: Request, format: str = "npz"):
+    # The request body is the raw .npz / .parquet file
+    try:
+        path = _temp_path(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        with open(path, "wb") as f:
+            async for chunk in request.stream():
+                f.write(chunk)
+        count = await asyncio.to_thread(db_manager.import_strategies, path)
+    except (ValueError, RuntimeError, sqlite3.IntegrityError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        os.remove(path)
+    return {"status": "success", "imported": count}
+
+def _parse_range_filters(request: Request) -> Dict[str, tuple]:
+    ranges = {}
+    for field in db_manager.RANGE_FIELDS:
+        low = request.query_params.get(f"min_{field}")
+        high = request.query_params.get(f"max_{field}")
+        if low is not None or high is not None:
+            ranges[field] = (float(low) if low is not None else None,
+                             float(high) if high is not None else None)
+    return ranges
+
+def _temp_path(fmt: str) -> str:
+    if fmt not in columnar_io.FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}' (expected one of {columnar_io.FORMATS})")
+    fd, path = tempfile.mkstemp(suffix=f".{fmt}")
+    os.close(fd)
+    return path
 
 # --- Bot Deployment API (v13.0) ---
 @app.post("/api/deploy")
 async def deploy_bot(config: DeployConfig):
+    if config.profile:
+        # The bot engine accepts a JobProfiler, but no route launches bots yet
+        raise HTTPException(status_code=400, detail="Profiling is not supported for deployments yet.")
     # ... (Identical to v13.0 server) ...
     return {"status": "error", "message": "Deployment endpoint not implemented in this manifest."}
 
@@ -104,9 +177,14 @@ async def start_optimization(config: HPTConfig):
     if not strategy:
         raise HTTPException(status_code=404, detail="Strategy not found.")
         
+    profiler = None
+    if config.profile:
+        profiler = _new_profiler(f"hpt_strategy_{strategy_id}")
+
     hpt_engine = HyperparameterEngine(
         strategy_config=dict(strategy),
-        emit_callback=emit_log_to_clients
+        emit_callback=emit_log_to_clients,
+        profiler=profiler
     )
     
     async def run_hpt_task():
@@ -119,7 +197,60 @@ async def start_optimization(config: HPTConfig):
                 del hpt_tasks[strategy_id]
                 
     hpt_tasks[strategy_id] = asyncio.create_task(run_hpt_task())
-    return {"status": "success", "message": f"HPT started for Strategy {strategy_id}."}
+    return {"status": "success", "message": f"HPT started for Strategy {strategy_id}.",
+            "job_id": profiler.job_id if profiler else None}
+
+@app.get("/api/optimize/{strategy_id}/export")
+async def export_optimization(strategy_id: int, format: str = "npz"):
+    strategy = db_manager.get_strategy(strategy_id)
+    if not strategy:
+        raise HTTPException(status_code=404, detail="Strategy not found.")
+    hpt_engine = HyperparameterEngine(strategy_config=dict(strategy), emit_callback=emit_log_to_clients)
+    try:
+        path = _temp_path(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        await asyncio.to_thread(hpt_engine.export_results, path)
+    except Exception as e:
+        os.remove(path)
+        if isinstance(e, KeyError):
+            raise HTTPException(status_code=404, detail=f"No HPT study found for Strategy {strategy_id}.")
+        if isinstance(e, RuntimeError):
+            raise HTTPException(status_code=400, detail=str(e))
+        raise
+    return FileResponse(path, filename=f"hpt_strategy_{strategy_id}.{format}", background=BackgroundTask(os.remove, path))
+
+# --- Profiling API ---
+def _new_profiler(prefix: str) -> JobProfiler:
+    # Unique per run so each job keeps its own profile and artifact
+    job_id = f"{prefix}_{time.strftime('%Y%m%dT%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    profiler = JobProfiler(job_id)
+    job_profilers[job_id] = profiler
+    finished = [jid for jid, p in job_profilers.items() if not p.running and jid != job_id]
+    for jid in finished[:max(0, len(job_profilers) - MAX_PROFILES_IN_MEMORY)]:
+        del job_profilers[jid]
+    return profiler
+
+@app.get("/api/profiles")
+async def list_profiles():
+    return {"status": "success", "profiles": [p.summary() for p in job_profilers.values()]}
+
+@app.get("/api/profiles/{job_id}")
+async def get_profile(job_id: str):
+    if job_id not in job_profilers:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return {"status": "success", "profile": job_profilers[job_id].summary()}
+
+@app.get("/api/profiles/{job_id}/flamegraph")
+async def get_flamegraph(job_id: str):
+    # Collapsed stacks: feed to flamegraph.pl or load into speedscope
+    if job_id in job_profilers:
+        return PlainTextResponse(job_profilers[job_id].collapsed())
+    path = os.path.join(PROFILE_DIR, f"{os.path.basename(job_id)}.folded")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return FileResponse(path, media_type="text/plain")
 
 # --- PBT API (v18.0) ---
 @app.post("/api/pbt/start/{strategy_id}")
@@ -9,6 +9,7 @@ from typing import Dict, Any, Tuple, Optional
 import numpy as np
 
 from .interfaces import BaseStrategyEnv
+from .bet_kernel import ROLL_RANGE, build_bet_table, resolve_bet, simulate_bets
 
 class SimulationEnv(BaseStrategyEnv):
     """
@@ -20,52 +21,35 @@ class SimulationEnv(BaseStrategyEnv):
         
         self.profit_target = self.start_balance * config.get("profit_target_percent", 5.0) / 100.0
         self.loss_limit = - (self.start_balance * config.get("loss_limit_percent", 10.0) / 100.0)
+        # Chance strings are parsed once; every bet goes through the shared kernel
+        self.bet_table = build_bet_table(self.action_map, self.base_bet)
         
     def _roll_dice(self) -> int:
-        return secrets.randbelow(10000)
+        return secrets.randbelow(ROLL_RANGE)
 
     async def _execute_bet(self, action_id: int) -> Tuple[float, bool]:
         """
         Simulates the bet.
         Returns: (normalized_reward, done)
         """
-        chance_str, multiplier = self.action_map[action_id]
-        chance = float(chance_str)
-        amount = self.base_bet * multiplier
+        amount = self.bet_table.per_action[action_id][2]
         
         if amount > self.balance:
             return 0, True # Terminated due to bankruptcy
             
         roll = self._roll_dice()
-        
-        # High/Low logic
-        payout = (100.0 / chance) * 0.99 # 1% house edge
         is_high = secrets.randbelow(2) == 0
-        
-        if is_high:
-            low_bound = 10000 - int(chance * 100)
-            high_bound = 9999
-        else:
-            low_bound = 0
-            high_bound = int(chance * 100) - 1
-            
-        is_win = (low_bound <= roll <= high_bound)
-        
-        if is_win:
-            profit = (amount * payout) - amount
-        else:
-            profit = -amount
+        profit = resolve_bet(self.bet_table, action_id, roll, is_high)
             
-        # De-normalize for state update, then re-normalize for reward
-        # This is the "true" profit/loss
-        self.session_profit += profit
-        self.balance += profit
+        # BaseStrategyEnv.step applies the (de-normalized) reward to
+        # balance / session_profit, so only look ahead here
+        session_profit = self.session_profit + profit
         
         # Check for termination
         terminated = False
-        if self.session_profit >= self.profit_target:
+        if session_profit >= self.profit_target:
             terminated = True
-        if self.session_profit <= self.loss_limit:
+        if session_profit <= self.loss_limit:
             terminated = True
             
         normalized_reward = profit / self.base_bet
@@ -78,3 +62,18 @@ class SimulationEnv(BaseStrategyEnv):
         self.balance = self.start_balance
         self.session_profit = 0.0
         return super().reset(seed=seed, options=options)
+
+    def simulate_batch(self, actions: np.ndarray, seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Simulates a whole sequence of actions from the start
+        balance in one kernel call (no profit target / loss
+        limit, bankruptcy only). Does not touch env state.
+        Payouts match step(); balances match it up to the
+        rounding of step()'s reward * base_bet de-normalization.
+        Returns: (profits, balances, n_executed)
+        """
+        rng = np.random.default_rng(seed)
+        n = len(actions)
+        rolls = rng.integers(0, ROLL_RANGE, size=n)
+        is_high = rng.integers(0, 2, size=n) == 0
+        return simulate_bets(self.bet_table, actions, rolls, is_high, self.start_balance)
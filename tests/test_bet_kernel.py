@@ -0,0 +1,116 @@
+"""The Numba loop kernel (run here as plain Python) and the NumPy
+fallback must agree exactly, including bust handling."""
+import asyncio
+
+import numpy as np
+import pytest
+
+from src import bet_kernel
+from src.bet_kernel import build_bet_table, resolve_bet, simulate_bets, _simulate_loop, _simulate_numpy
+
+ACTION_MAP = {
+    0: ("49.5", 1.0),
+    1: ("33.0", 1.5),
+    2: ("75.0", 0.75),
+    3: ("49.5", 2.0),
+    4: ("25.0", 3.0),
+}
+
+def _random_bets(seed, n):
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, len(ACTION_MAP), size=n)
+    rolls = rng.integers(0, 10000, size=n)
+    is_high = rng.integers(0, 2, size=n).astype(np.bool_)
+    return actions, rolls, is_high
+
+def _run_both(table, actions, rolls, is_high, start_balance):
+    args = (table.thresholds, table.payouts, table.amounts, actions, rolls, is_high, start_balance)
+    return _simulate_loop(*args), _simulate_numpy(*args)
+
+def _assert_same(loop, vectorised):
+    assert loop[2] == vectorised[2]
+    np.testing.assert_array_equal(loop[0], vectorised[0])
+    np.testing.assert_array_equal(loop[1], vectorised[1])
+
+@pytest.mark.parametrize("seed", range(5))
+def test_kernels_agree_without_bust(seed):
+    table = build_bet_table(ACTION_MAP, 1e-4)
+    actions, rolls, is_high = _random_bets(seed, 2000)
+    loop, vectorised = _run_both(table, actions, rolls, is_high, 1.0)
+    assert loop[2] == 2000
+    _assert_same(loop, vectorised)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_kernels_agree_on_bust(seed):
+    # Stakes of 1-3% of the start balance bust well within 2000 bets
+    table = build_bet_table(ACTION_MAP, 1e-2)
+    actions, rolls, is_high = _random_bets(seed, 2000)
+    loop, vectorised = _run_both(table, actions, rolls, is_high, 0.05)
+    assert loop[2] < 2000
+    _assert_same(loop, vectorised)
+    assert np.all(loop[0][loop[2]:] == 0.0)
+    assert np.all(loop[1][loop[2]:] == loop[1][loop[2] - 1 if loop[2] else 0])
+
+def test_kernels_agree_on_immediate_bust():
+    table = build_bet_table(ACTION_MAP, 1.0)
+    actions, rolls, is_high = _random_bets(0, 10)
+    loop, vectorised = _run_both(table, actions, rolls, is_high, 0.5)
+    assert loop[2] == 0
+    _assert_same(loop, vectorised)
+    assert np.all(loop[1] == 0.5)
+
+def test_kernels_agree_on_empty_input():
+    table = build_bet_table(ACTION_MAP, 1e-4)
+    empty = np.array([], dtype=np.int64)
+    loop, vectorised = _run_both(table, empty, empty, empty.astype(np.bool_), 1.0)
+    assert loop[2] == vectorised[2] == 0
+    assert len(loop[0]) == len(vectorised[0]) == 0
+
+def test_scalar_path_matches_kernel():
+    table = build_bet_table(ACTION_MAP, 1e-4)
+    actions, rolls, is_high = _random_bets(1, 500)
+    profits, _, _ = _simulate_loop(table.thresholds, table.payouts, table.amounts,
+                                   actions, rolls, is_high, 1.0)
+    scalar = [resolve_bet(table, int(a), int(r), bool(h)) for a, r, h in zip(actions, rolls, is_high)]
+    np.testing.assert_array_equal(profits, scalar)
+
+@pytest.mark.parametrize("start_balance", [1.0, 0.05])
+def test_compiled_kernel_matches_numpy(start_balance):
+    pytest.importorskip("numba")
+    table = build_bet_table(ACTION_MAP, 1e-2)
+    actions, rolls, is_high = _random_bets(7, 2000)
+    args = (table.thresholds, table.payouts, table.amounts, actions, rolls, is_high, start_balance)
+    _assert_same(bet_kernel._simulate(*args), _simulate_numpy(*args))
+
+def test_simulate_bets_matches_kernel():
+    table = build_bet_table(ACTION_MAP, 1e-2)
+    actions, rolls, is_high = _random_bets(3, 500)
+    profits, balances, n_executed = simulate_bets(table, actions.tolist(), rolls, is_high, 0.05)
+    _assert_same((profits, balances, n_executed),
+                 _simulate_numpy(table.thresholds, table.payouts, table.amounts, actions, rolls, is_high, 0.05))
+    assert isinstance(n_executed, int)
+
+@pytest.mark.parametrize("actions", [[0, -1], [0, 5], [0.7, 1.0], [True, False]])
+def test_simulate_bets_rejects_invalid_actions(actions):
+    table = build_bet_table(ACTION_MAP, 1e-4)
+    with pytest.raises(ValueError):
+        simulate_bets(table, actions, [0, 0], [True, False], 1.0)
+
+def test_simulate_bets_rejects_mismatched_lengths():
+    table = build_bet_table(ACTION_MAP, 1e-4)
+    with pytest.raises(ValueError):
+        simulate_bets(table, [0, 1], [0], [True, False], 1.0)
+
+def test_env_step_applies_profit_once(monkeypatch):
+    pytest.importorskip("gymnasium")
+    from src import simulation_env_v14
+    env = simulation_env_v14.SimulationEnv({"start_balance": 1.0, "base_bet_divisor": 100.0})
+    env.reset()
+    # randbelow -> 0: roll 0 and is_high, so every bet loses its stake
+    monkeypatch.setattr(simulation_env_v14.secrets, "randbelow", lambda n: 0)
+    for action in range(len(ACTION_MAP)):
+        before = env.balance
+        expected = resolve_bet(env.bet_table, action, 0, True)
+        asyncio.run(env.step(action))
+        assert env.balance - before == pytest.approx(expected, rel=1e-12)
+    assert env.session_profit == pytest.approx(env.balance - 1.0, rel=1e-12)
@@ -0,0 +1,67 @@
+"""Round trips through the columnar formats, including nulls."""
+import math
+import zipfile
+
+import numpy as np
+import pytest
+
+from src.columnar_io import write_batches, read_batches
+
+COLUMNS = {"id": "int", "name": "str", "kappa": "float"}
+ROWS = [
+    {"id": 1, "name": "", "kappa": float("nan")},
+    {"id": None, "name": None, "kappa": None},
+    {"id": 3, "name": "alpha", "kappa": 0.5},
+]
+
+def _read_all(path, batch_size=1000):
+    return [row for batch in read_batches(path, batch_size=batch_size) for row in batch]
+
+def _assert_rows_equal(actual, expected):
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        assert got.keys() == want.keys()
+        for key, value in want.items():
+            if isinstance(value, float) and math.isnan(value):
+                assert isinstance(got[key], float) and math.isnan(got[key])
+            else:
+                assert got[key] == value
+
+@pytest.mark.parametrize("fmt", ["npz", "parquet"])
+def test_round_trip_keeps_empty_strings_nulls_and_nan(tmp_path, fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"rows.{fmt}")
+    # Two batches so the first one holds the odd values on its own
+    assert write_batches(path, COLUMNS, [ROWS[:2], ROWS[2:]]) == 3
+    _assert_rows_equal(_read_all(path, batch_size=2), ROWS)
+
+def test_npz_empty_export_reads_back_empty(tmp_path):
+    path = str(tmp_path / "empty.npz")
+    assert write_batches(path, COLUMNS, []) == 0
+    assert _read_all(path) == []
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_batches(str(tmp_path / "rows.csv"), COLUMNS, [ROWS])
+
+@pytest.mark.parametrize("content", [b"", b"PK\x03\x04truncated", b"not a zip at all"])
+def test_unreadable_npz_raises_value_error(tmp_path, content):
+    path = tmp_path / "bad.npz"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        _read_all(str(path))
+
+@pytest.mark.parametrize("content", [b"", b"PAR1garbage"])
+def test_unreadable_parquet_raises_value_error(tmp_path, content):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "bad.parquet"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        _read_all(str(path))
+
+def test_npz_columns_of_different_lengths_raise_value_error(tmp_path):
+    path = str(tmp_path / "ragged.npz")
+    np.savez(path, name=np.array(["a", "b"]), kappa=np.array([0.1]))
+    with pytest.raises(ValueError):
+        _read_all(path)
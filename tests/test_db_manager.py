@@ -0,0 +1,73 @@
+"""Strategy queries and bulk import/export against a throwaway database."""
+import numpy as np
+import pytest
+
+from src import db_manager
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_manager, "DB_PATH", str(tmp_path / "strategies.db"))
+    db_manager.initialize_db()
+    for i in range(10):
+        db_manager.create_strategy({
+            "name": f"s{i}", "currency": "BTC" if i % 2 else "ETH",
+            "base_bet_divisor": 10000.0, "profit_target_percent": 5.0,
+            "loss_limit_percent": 10.0, "kappa": i / 10,
+        })
+    return db_manager
+
+def _ids(rows):
+    return [row["id"] for row in rows]
+
+def test_keyset_pagination_walks_every_row_once(db):
+    seen, cursor = [], None
+    while True:
+        page = db.query_strategies(after_id=cursor, limit=3)
+        if not page:
+            break
+        seen += _ids(page)
+        cursor = page[-1]["id"]
+    assert seen == list(range(1, 11))
+
+def test_filters_combine_currency_and_ranges(db):
+    rows = db.query_strategies(currency="BTC", ranges={"kappa": (0.3, 0.7)})
+    assert _ids(rows) == [4, 6, 8]
+    assert all(row["currency"] == "BTC" for row in rows)
+    assert _ids(db.query_strategies(ranges={"kappa": (None, 0.15)})) == [1, 2]
+
+def test_range_filter_on_unknown_field_is_rejected(db):
+    with pytest.raises(ValueError):
+        db.query_strategies(ranges={"name": (0, 1)})
+
+def test_iter_strategies_batches(db):
+    assert [len(batch) for batch in db.iter_strategies(batch_size=4)] == [4, 4, 2]
+
+@pytest.mark.parametrize("fmt", ["npz", "parquet"])
+def test_export_import_round_trip(db, tmp_path, fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    db.create_strategy({"name": "", "currency": ""})
+    path = str(tmp_path / f"strategies.{fmt}")
+    assert db.export_strategies(path, batch_size=4) == 11
+    assert db.import_strategies(path, batch_size=4) == 11
+
+    rows = [dict(row) for row in db.query_strategies(limit=100)]
+    originals, imported = rows[:11], rows[11:]
+    for original, copy in zip(originals, imported):
+        assert {k: v for k, v in copy.items() if k != "id"} == {k: v for k, v in original.items() if k != "id"}
+    assert imported[-1]["name"] == "" and imported[-1]["currency"] == ""
+    assert imported[-1]["kappa"] is None
+
+def test_import_without_required_column_inserts_nothing(db, tmp_path):
+    path = str(tmp_path / "no_name.npz")
+    np.savez(path, currency=np.array(["BTC", "ETH"]))
+    with pytest.raises(ValueError):
+        db.import_strategies(path)
+    assert len(db.query_strategies(limit=100)) == 10
+
+def test_import_rolls_back_earlier_batches_on_constraint_error(db, tmp_path):
+    path = str(tmp_path / "null_name.npz")
+    np.savez(path, name=np.array(["ok", "ok", ""]), name__null=np.array([False, False, True]))
+    with pytest.raises(db.sqlite3.IntegrityError):
+        db.import_strategies(path, batch_size=2)
+    assert len(db.query_strategies(limit=100)) == 10
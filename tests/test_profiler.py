@@ -0,0 +1,122 @@
+"""JobProfiler attribution and lifecycle, plus the profiles API."""
+import asyncio
+import os
+import time
+
+import pytest
+
+from src import profiler as profiler_module
+from src.profiler import JobProfiler, ENV_STEP, LOG_EMISSION
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler_module, "PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+def _burn(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def test_busy_section_is_active_and_awaiting_section_is_not():
+    async def main():
+        busy, waiting = JobProfiler("busy", interval=0.001), JobProfiler("waiting", interval=0.001)
+        busy.start(); waiting.start()
+
+        async def emit(_):
+            await asyncio.sleep(0.02)
+        emit = waiting.wrap_async(LOG_EMISSION, emit)
+
+        async def waiting_job():
+            for _ in range(10):
+                await emit("msg")
+
+        async def busy_job():
+            for _ in range(10):
+                with busy.section(ENV_STEP):
+                    _burn(0.02)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(waiting_job(), busy_job())
+        busy.stop(); waiting.stop()
+        return busy, waiting
+
+    busy, waiting = asyncio.run(main())
+    busy_step = busy.summary()["sections"][ENV_STEP]
+    waiting_emit = waiting.summary()["sections"][LOG_EMISSION]
+    assert busy_step["calls"] == 10 and busy_step["active_s"] > 0
+    # The busy job ran while the other was suspended; none of it is the waiter's
+    assert waiting_emit["calls"] == 10 and waiting_emit["wall_s"] > 0
+    # (a sample can land in the few microseconds before the await suspends)
+    assert waiting_emit["active_s"] == pytest.approx(0, abs=0.005)
+    assert "_burn" in busy.collapsed() and "_burn" not in waiting.collapsed()
+
+def test_stop_writes_folded_file(profile_dir):
+    async def main():
+        job = JobProfiler("job", interval=0.001)
+        job.start()
+        with job.section(ENV_STEP):
+            _burn(0.05)
+        return job, job.stop()
+
+    job, path = asyncio.run(main())
+    assert path == os.path.join(str(profile_dir), "job.folded")
+    with open(path) as f:
+        assert f.read() == job.collapsed()
+    assert job.collapsed().startswith(ENV_STEP + ";")
+    assert not job.running
+
+def test_restart_clears_previous_run():
+    async def main():
+        job = JobProfiler("job", interval=0.001)
+        job.start()
+        with job.section(ENV_STEP):
+            _burn(0.05)
+        job.stop()
+        assert job.sample_count > 0
+
+        job.start()
+        assert job.running
+        summary = job.summary()
+        assert summary["samples"] == 0 and summary["sections"] == {}
+        with job.section(LOG_EMISSION):
+            _burn(0.05)
+        job.stop()
+        return job
+
+    job = asyncio.run(main())
+    assert set(job.summary()["sections"]) == {LOG_EMISSION}
+    assert job.sample_count > 0
+
+def test_profiles_api_not_found_paths(profile_dir, monkeypatch):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    pytest.importorskip("optuna")
+    pytest.importorskip("gymnasium")
+    from fastapi.testclient import TestClient
+    from src import server_v18
+
+    monkeypatch.setattr(server_v18, "PROFILE_DIR", str(profile_dir))
+    monkeypatch.setattr(server_v18, "job_profilers", {})
+    client = TestClient(server_v18.app)
+
+    assert client.get("/api/profiles/missing").status_code == 404
+    assert client.get("/api/profiles/missing/flamegraph").status_code == 404
+
+    # Evicted / finished jobs are still served from their artifact
+    (profile_dir / "old_job.folded").write_text("env_step;main (x.py) 3\n")
+    response = client.get("/api/profiles/old_job/flamegraph")
+    assert response.status_code == 200 and response.text == "env_step;main (x.py) 3\n"
+
+def test_each_run_gets_its_own_job_id(monkeypatch):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("optuna")
+    pytest.importorskip("gymnasium")
+    from src import server_v18
+
+    monkeypatch.setattr(server_v18, "job_profilers", {})
+    first = server_v18._new_profiler("hpt_strategy_1")
+    second = server_v18._new_profiler("hpt_strategy_1")
+    assert first.job_id != second.job_id
+    assert first.job_id.startswith("hpt_strategy_1_")
+    assert set(server_v18.job_profilers) == {first.job_id, second.job_id}